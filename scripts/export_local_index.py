@@ -0,0 +1,63 @@
+"""How to run it:
+
+python -m scripts.export_local_index --output-dir output --quantize int8 --out local_index/int8.npz
+
+Optionally add --projection models/pca_384.npz to store reduced vectors.
+Load the .npz and use search_int8 / search_binary from src.vectorizer.projection
+for local search without Pinecone.
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+
+from scripts.fit_projection import embed_chapters
+from scripts.index_chapters import load_validated_results
+from src.vectorizer.projection import PCAProjection, quantize_binary, quantize_int8
+
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Export quantized chunk vectors for local search")
+    parser.add_argument("--output-dir", default="output", help="Folder with *_validated_*.json")
+    parser.add_argument("--quantize", choices=["int8", "binary"], default="int8")
+    parser.add_argument("--projection", default=None, help="Optional PCA projection .npz")
+    parser.add_argument("--out", required=True, help="Output .npz path")
+    args = parser.parse_args()
+
+    results = load_validated_results(args.output_dir)
+    if not results:
+        print(f"No validated JSON files found in {args.output_dir}")
+        return
+
+    ids, chunks, vectors = embed_chapters(results)
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    projection_version = ""
+    if args.projection:
+        projection = PCAProjection.load(args.projection)
+        vectors = projection.transform(vectors)
+        projection_version = projection.version
+
+    arrays = {}
+    if args.quantize == "int8":
+        arrays["codes"], arrays["scales"] = quantize_int8(vectors)
+    else:
+        arrays["codes"] = quantize_binary(vectors)
+
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    np.savez(
+        args.out,
+        ids=np.array(ids),
+        chunk_text=np.array([c[:1000] for c in chunks]),
+        quantize=np.array(args.quantize),
+        projection=np.array(projection_version),
+        **arrays,
+    )
+    print(f"Exported {len(ids)} {args.quantize} vectors (dim={vectors.shape[1]}) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
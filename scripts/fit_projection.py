@@ -0,0 +1,163 @@
+"""How to run it:
+
+Process and save a few sample chapters to output/ first, then from project root:
+
+python -m scripts.fit_projection --output-dir output --dims 128 256 384 512 --top-k 10
+
+This fits each projection on part of the chapters and prints recall@k of each
+reduced/quantized variant against the full 1024-dim vectors on the held-out
+chapters. To persist a projection for indexing and querying:
+
+python -m scripts.fit_projection --output-dir output --save-dim 384 --save-path models/pca_384.npz
+
+Then pass --projection models/pca_384.npz to scripts.index_chapters and
+scripts.query_pinecone (the Pinecone index must be created with dimension 384).
+"""
+import argparse
+
+import numpy as np
+from dotenv import load_dotenv
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_community.embeddings import HuggingFaceEmbeddings
+
+from scripts.index_chapters import load_validated_results
+from src.models.schemas import ValidatedResult
+from src.vectorizer.projection import (
+    PCAProjection,
+    quantize_binary,
+    quantize_int8,
+    recall_at_k,
+    search_binary,
+    search_int8,
+)
+
+
+def embed_chapters(
+    results: list[ValidatedResult],
+    chunk_size: int = 512,
+    chunk_overlap: int = 50,
+    model_name: str = "intfloat/multilingual-e5-large",
+) -> tuple[list[str], list[str], np.ndarray]:
+    """Chunk and embed chapters the same way PineconeVectorizer does. Returns (ids, chunks, vectors)."""
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", ". ", " ", ""],
+    )
+    embeddings = HuggingFaceEmbeddings(model_name=model_name)
+
+    ids: list[str] = []
+    chunks: list[str] = []
+    for res in results:
+        for i, chunk in enumerate(splitter.split_text(res.content or "")):
+            ids.append(f"{res.lesson_id}_{i}")
+            chunks.append(chunk)
+
+    vectors = np.asarray(embeddings.embed_documents(chunks), dtype=np.float32)
+    return ids, chunks, vectors
+
+
+def _split_holdout(
+    ids: list[str], vectors: np.ndarray, holdout: float, rng: np.random.Generator
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Split vectors into (fit, eval) sets.
+
+    Whole chapters are held out when there are at least two, so the
+    projection is scored on chapters it never saw; otherwise chunks are split.
+    """
+    lessons = np.array([chunk_id.rsplit("_", 1)[0] for chunk_id in ids])
+    unique = np.unique(lessons)
+    if len(unique) >= 2:
+        n_eval = min(len(unique) - 1, max(1, round(len(unique) * holdout)))
+        eval_mask = np.isin(lessons, rng.choice(unique, size=n_eval, replace=False))
+    else:
+        n_eval = min(len(ids) - 1, max(1, round(len(ids) * holdout)))
+        eval_mask = np.zeros(len(ids), dtype=bool)
+        eval_mask[rng.choice(len(ids), size=n_eval, replace=False)] = True
+    return vectors[~eval_mask], vectors[eval_mask]
+
+
+def _without_self(idx: np.ndarray, query: int, top_k: int) -> np.ndarray:
+    """Drop the query's own index from a top_k+1 result list."""
+    return idx[idx != query][:top_k]
+
+
+def _exact_top_k(corpus: np.ndarray, q_idx: np.ndarray, top_k: int) -> list[np.ndarray]:
+    """Brute-force cosine top_k for corpus[q_idx], excluding each query itself."""
+    scores = corpus[q_idx] @ corpus.T
+    return [_without_self(np.argsort(-row)[:top_k + 1], i, top_k) for i, row in zip(q_idx, scores)]
+
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Fit and evaluate a PCA projection for embeddings")
+    parser.add_argument("--output-dir", default="output", help="Folder with *_validated_*.json")
+    parser.add_argument("--dims", type=int, nargs="+", default=[128, 256, 384, 512],
+                        help="Target dimensions to evaluate")
+    parser.add_argument("--top-k", type=int, default=10, help="k for recall@k")
+    parser.add_argument("--num-queries", type=int, default=200,
+                        help="Number of chunks sampled as queries")
+    parser.add_argument("--holdout", type=float, default=0.3,
+                        help="Fraction of chapters (or chunks, for a single chapter) held out for evaluation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-dim", type=int, default=None, help="Fit and save a projection of this dim")
+    parser.add_argument("--save-path", default=None, help="Where to save the projection (.npz)")
+    args = parser.parse_args()
+
+    results = load_validated_results(args.output_dir)
+    if not results:
+        print(f"No validated JSON files found in {args.output_dir}")
+        return
+
+    ids, _, vectors = embed_chapters(results)
+    print(f"Embedded {len(vectors)} chunks from {len(results)} chapters (dim={vectors.shape[1]}).")
+
+    rng = np.random.default_rng(args.seed)
+    fit_vecs, eval_vecs = _split_holdout(ids, vectors, args.holdout, rng)
+    print(f"Fitting on {len(fit_vecs)} chunks, evaluating on {len(eval_vecs)} held-out chunks.")
+
+    eval_full = eval_vecs / np.linalg.norm(eval_vecs, axis=1, keepdims=True)
+    q_idx = rng.choice(len(eval_full), size=min(args.num_queries, len(eval_full)), replace=False)
+    k = args.top_k
+    truth = _exact_top_k(eval_full, q_idx, k)
+
+    def report(label: str, dim: int, bytes_per_vec: int, found: list[np.ndarray]) -> None:
+        recall = recall_at_k(truth, found)
+        print(f"{label:<10} dim={dim:<5} bytes/vec={bytes_per_vec:<6} recall@{k}={recall:.3f}")
+
+    print()
+    full_dim = eval_full.shape[1]
+    report("float32", full_dim, full_dim * 4, truth)
+
+    codes, scales = quantize_int8(eval_full)
+    report("int8", full_dim, full_dim + 4,
+           [_without_self(search_int8(eval_full[i], codes, scales, k + 1), i, k) for i in q_idx])
+
+    bits = quantize_binary(eval_full)
+    report("binary", full_dim, bits.shape[1],
+           [_without_self(search_binary(eval_full[i], bits, k + 1), i, k) for i in q_idx])
+
+    for dim in args.dims:
+        if dim > min(fit_vecs.shape):
+            print(f"pca        dim={dim:<5} skipped (only {len(fit_vecs)} vectors to fit on)")
+            continue
+        reduced = PCAProjection.fit(fit_vecs, dim).transform(eval_vecs)
+        report("pca", dim, dim * 4, _exact_top_k(reduced, q_idx, k))
+
+        codes, scales = quantize_int8(reduced)
+        report("pca+int8", dim, dim + 4,
+               [_without_self(search_int8(reduced[i], codes, scales, k + 1), i, k) for i in q_idx])
+
+    if args.save_dim:
+        if not args.save_path:
+            raise ValueError("--save-path is required with --save-dim")
+        # Evaluation is only for choosing the dim; the saved projection uses every chunk
+        projection = PCAProjection.fit(vectors, args.save_dim)
+        projection.save(args.save_path)
+        print(f"\nSaved projection {projection.version} to {args.save_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,13 @@ import json
 import os
 from pathlib import Path
 
+import yaml
 from dotenv import load_dotenv
 
 from src.models.schemas import ValidatedResult
+from src.vectorizer.fake_index import FakePineconeIndex
 from src.vectorizer.pinecone_vectorizer import PineconeVectorizer
+from src.vectorizer.projection import PCAProjection
 
 
 def load_validated_results(output_dir: str) -> list[ValidatedResult]:
@@ -19,26 +22,56 @@ def load_validated_results(output_dir: str) -> list[ValidatedResult]:
     return results
 
 
+def load_namespace_pattern(config_path: str | None) -> str | None:
+    """Read pinecone.namespace_pattern from a YAML config, if the file exists."""
+    if not config_path or not Path(config_path).is_file():
+        return None
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    return (config.get("pinecone") or {}).get("namespace_pattern")
+
+
 def main():
     load_dotenv()
 
     parser = argparse.ArgumentParser(description="Index chapter JSONs into Pinecone")
     parser.add_argument("--output-dir", default="output", help="Folder with *_validated_*.json")
-    parser.add_argument("--namespace", default=None, help="Optional Pinecone namespace")
+    parser.add_argument("--config", default="config/production.yml",
+                        help="YAML config with pinecone.namespace_pattern")
+    parser.add_argument("--namespace", default=None,
+                        help="Put every chapter in this namespace instead of using namespace_pattern")
+    parser.add_argument("--batch-size", type=int, default=100, help="Max vectors per upsert request")
+    parser.add_argument("--max-in-flight", type=int, default=8,
+                        help="Max concurrent upsert requests across all namespaces")
+    parser.add_argument("--pool-threads", type=int, default=8, help="Pinecone client connection pool size")
+    parser.add_argument("--fake-index", action="store_true",
+                        help="Upsert into an in-memory fake index instead of Pinecone")
+    parser.add_argument("--projection", default=os.getenv("PINECONE_PROJECTION_PATH"),
+                        help="Optional PCA projection .npz (from scripts.fit_projection)")
     args = parser.parse_args()
 
     api_key = os.getenv("PINECONE_API_KEY")
     index_name = os.getenv("PINECONE_INDEX_NAME")
 
-    if not api_key or not index_name:
+    fake_index = FakePineconeIndex(pool_threads=args.pool_threads) if args.fake_index else None
+    if fake_index is not None:
+        index_name = index_name or "fake-index"
+    elif not api_key or not index_name:
         raise RuntimeError("PINECONE_API_KEY or PINECONE_INDEX_NAME not set in .env")
 
+    namespace_pattern = load_namespace_pattern(args.config)
+
+    projection = PCAProjection.load(args.projection) if args.projection else None
+
     vectorizer = PineconeVectorizer(
         api_key=api_key,
         index_name=index_name,
         chunk_size=512,
         chunk_overlap=50,
         model_name="intfloat/multilingual-e5-large",
+        projection=projection,
+        pool_threads=args.pool_threads,
+        index=fake_index,
     )
 
     results = load_validated_results(args.output_dir)
@@ -47,8 +80,22 @@ def main():
         return
 
     print(f"Indexing {len(results)} chapters into Pinecone index '{index_name}'...")
-    vectorizer.upsert_validated_results(results, namespace=args.namespace)
-    print("Indexing complete.")
+    report = vectorizer.upsert_validated_results(
+        results,
+        namespace=args.namespace,
+        batch_size=args.batch_size,
+        namespace_pattern=namespace_pattern,
+        max_in_flight=args.max_in_flight,
+    )
+    for ns, count in sorted(report.namespaces.items()):
+        print(f"  {ns or '(default)'}: {count} vectors")
+    print(
+        f"Indexing complete: {report.vectors} vectors in {report.requests} requests, "
+        f"{report.seconds:.1f}s ({report.vectors_per_sec:.1f} vectors/s, "
+        f"{report.requests_per_sec:.1f} upserts/s); embedding took {report.embed_seconds:.1f}s."
+    )
+    if fake_index is not None:
+        fake_index.close()
 
 
 if __name__ == "__main__":
@@ -13,13 +13,16 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from dotenv import load_dotenv
 
+from src.extractor.image_extractor import make_image_executor
 from src.models.schemas import ProcessingConfig
 from src.utils.pipeline_single import process_single_pdf
 
 
-def _process_one(pdf_path: Path, config: ProcessingConfig, output_dir: str) -> tuple[str, str]:
+def _process_one(pdf_path: Path, config: ProcessingConfig, output_dir: str,
+                 image_executor=None) -> tuple[str, str]:
     """Helper to process a single PDF and return (pdf_name, lesson_id)."""
-    res = process_single_pdf(str(pdf_path), config=config, output_dir=output_dir)
+    res = process_single_pdf(str(pdf_path), config=config, output_dir=output_dir,
+                             image_executor=image_executor)
     return pdf_path.name, res.lesson_id
 
 
@@ -33,6 +36,10 @@ def main():
     parser.add_argument("--grade", type=int, required=True)
     parser.add_argument("--book", required=True)
     parser.add_argument("--language", default=os.getenv("DEFAULT_LANGUAGE", "en"))
+    parser.add_argument("--extract-images", action="store_true", help="Export unique images as PNG")
+    parser.add_argument("--thumbnail-size", type=int, default=None,
+                        help="Downscale exported images so the longest side is at most this many pixels")
+    parser.add_argument("--image-workers", type=int, default=4, help="Processes used to decode images")
     parser.add_argument("--output-dir", default="output", help="Where to store JSON outputs")
     parser.add_argument("--workers", type=int, default=4, help="Number of parallel workers")
 
@@ -58,14 +65,20 @@ def main():
         grade=args.grade,
         book=args.book,
         language=args.language,
+        extract_images=args.extract_images,
+        image_thumbnail_size=args.thumbnail_size,
+        image_workers=args.image_workers,
     )
 
     results = []
 
+    # One image decoding pool shared by all PDF threads
+    image_executor = make_image_executor(args.image_workers) if args.extract_images else None
+
     # Parallel processing
     with ThreadPoolExecutor(max_workers=args.workers) as executor:
         future_to_pdf = {
-            executor.submit(_process_one, pdf_path, config, output_dir): pdf_path
+            executor.submit(_process_one, pdf_path, config, output_dir, image_executor): pdf_path
             for pdf_path in pdf_files
         }
 
@@ -78,6 +91,9 @@ def main():
             except Exception as e:
                 print(f"[ERROR] {pdf_path.name}: {e}")
 
+    if image_executor is not None:
+        image_executor.shutdown()
+
     print("\nBatch processing complete.")
     print(f"Total processed: {len(results)} / {len(pdf_files)}")
 
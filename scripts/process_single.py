@@ -18,6 +18,10 @@ def main():
     parser.add_argument("--grade", type=int, required=True)
     parser.add_argument("--book", required=True)
     parser.add_argument("--language", default=os.getenv("DEFAULT_LANGUAGE", "en"))
+    parser.add_argument("--extract-images", action="store_true", help="Export unique images as PNG")
+    parser.add_argument("--thumbnail-size", type=int, default=None,
+                        help="Downscale exported images so the longest side is at most this many pixels")
+    parser.add_argument("--image-workers", type=int, default=4, help="Processes used to decode images")
 
     args = parser.parse_args()
 
@@ -27,6 +31,9 @@ def main():
         grade=args.grade,
         book=args.book,
         language=args.language,
+        extract_images=args.extract_images,
+        image_thumbnail_size=args.thumbnail_size,
+        image_workers=args.image_workers,
     )
 
     validated = process_single_pdf(args.pdf, config=config, output_dir="output")
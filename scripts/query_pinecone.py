@@ -5,6 +5,10 @@ from dotenv import load_dotenv
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from pinecone import Pinecone
 
+from scripts.index_chapters import load_namespace_pattern
+from src.vectorizer.pinecone_vectorizer import format_namespace
+from src.vectorizer.projection import PCAProjection
+
 
 def main():
     load_dotenv()
@@ -12,7 +16,15 @@ def main():
     parser = argparse.ArgumentParser(description="Test query against Pinecone index")
     parser.add_argument("--query", required=True, help="User question or search text")
     parser.add_argument("--top-k", type=int, default=5, help="Number of results to return")
-    parser.add_argument("--namespace", default=None, help="Namespace used during indexing")
+    parser.add_argument("--namespace", default=None,
+                        help="Namespace to query (overrides --board/--grade/--subject)")
+    parser.add_argument("--config", default="config/production.yml",
+                        help="YAML config with pinecone.namespace_pattern")
+    parser.add_argument("--board", default=os.getenv("DEFAULT_BOARD", "State Board Maharashtra"))
+    parser.add_argument("--grade", type=int, default=None)
+    parser.add_argument("--subject", default=None)
+    parser.add_argument("--projection", default=os.getenv("PINECONE_PROJECTION_PATH"),
+                        help="PCA projection .npz used during indexing, if any")
     args = parser.parse_args()
 
     api_key = os.getenv("PINECONE_API_KEY")
@@ -20,6 +32,16 @@ def main():
     if not api_key or not index_name:
         raise RuntimeError("PINECONE_API_KEY or PINECONE_INDEX_NAME not set in .env")
 
+    # Same namespace the indexer derived from namespace_pattern
+    namespace = args.namespace
+    namespace_pattern = load_namespace_pattern(args.config)
+    if namespace is None and namespace_pattern:
+        fields = {"board": args.board, "grade": args.grade, "subject": args.subject}
+        try:
+            namespace = format_namespace(namespace_pattern, fields)
+        except ValueError as e:
+            parser.error(f"{e}; pass --board/--grade/--subject or --namespace")
+
     # 1) Connect to Pinecone
     pc = Pinecone(api_key=api_key)
     index = pc.Index(index_name)
@@ -30,16 +52,21 @@ def main():
     # 3) Embed the query text
     query_vec = embeddings.embed_query(args.query)
 
+    # 3b) Apply the same projection used for indexing
+    projection = PCAProjection.load(args.projection) if args.projection else None
+    if projection is not None:
+        query_vec = projection.transform_one(query_vec)
+
     # 4) Query Pinecone
     response = index.query(
         vector=query_vec,
         top_k=args.top_k,
-        namespace=args.namespace,
+        namespace=namespace,
         include_metadata=True,
     )
 
     # 5) Print results
-    print(f"\nTop {args.top_k} results for query: {args.query}\n")
+    print(f"\nTop {args.top_k} results for query: {args.query} (namespace={namespace})\n")
     for match in response.get("matches", []):
         score = match.get("score")
         meta = match.get("metadata", {})
@@ -47,6 +74,9 @@ def main():
         lesson_id = meta.get("lesson_id")
         chapter_no = meta.get("chapter_no")
         title = meta.get("title")
+        if projection is not None and meta.get("projection") != projection.version:
+            print(f"[WARN] Match was indexed with projection {meta.get('projection')!r}, "
+                  f"query uses {projection.version!r}")
 
         print("------------------------------------------------------------")
         print(f"Score: {score:.4f}")
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import fitz  # PyMuPDF
+
+from src.models.schemas import ExtractedImage, PageImageRef
+
+logger = logging.getLogger(__name__)
+
+
+class PyMuPDFImageExtractor:
+    """
+    Inventory and export images from a PDF using PyMuPDF.
+
+    Every image xref is read and hashed once per document, so images shared
+    across pages (logos, repeated diagrams) are counted and written once.
+
+    Pass a shared `executor` (see make_image_executor) when exporting from
+    several threads, so all PDFs decode in one process pool.
+    """
+
+    def __init__(self, thumbnail_size: int | None = None, workers: int = 4,
+                 executor: Executor | None = None):
+        self.thumbnail_size = thumbnail_size
+        self.workers = workers
+        self.executor = executor
+
+    def inventory(
+        self, doc: fitz.Document
+    ) -> Tuple[Dict[int, List[PageImageRef]], List[ExtractedImage]]:
+        """
+        Build per-page image references and the list of unique images.
+
+        Returns (refs_by_page, images) where refs_by_page maps a 1-based
+        page number to the images drawn on it.
+        """
+        digest_by_xref: Dict[int, str] = {}
+        images_by_digest: Dict[str, ExtractedImage] = {}
+        refs_by_page: Dict[int, List[PageImageRef]] = {}
+
+        for page_index in range(len(doc)):
+            page_number = page_index + 1
+            refs: List[PageImageRef] = []
+            seen_on_page: set[str] = set()
+
+            # (xref, smask, width, height, bpc, colorspace, alt_cs, name, filter, referencer)
+            for info in doc.get_page_images(page_index, full=True):
+                xref, smask, width, height = info[0], info[1], info[2], info[3]
+                name = info[7] or None
+
+                digest = digest_by_xref.get(xref)
+                if digest is None:
+                    digest = self._hash_image(doc, xref, smask)
+                    digest_by_xref[xref] = digest
+
+                image = images_by_digest.get(digest)
+                if image is None:
+                    image = ExtractedImage(
+                        digest=digest,
+                        xref=xref,
+                        smask=smask,
+                        width=width,
+                        height=height,
+                    )
+                    images_by_digest[digest] = image
+
+                # The same image may be placed several times on one page
+                if digest in seen_on_page:
+                    continue
+                seen_on_page.add(digest)
+
+                if not image.page_numbers or image.page_numbers[-1] != page_number:
+                    image.page_numbers.append(page_number)
+                refs.append(
+                    PageImageRef(
+                        xref=xref,
+                        digest=digest,
+                        width=width,
+                        height=height,
+                        name=name,
+                    )
+                )
+
+            refs_by_page[page_number] = refs
+
+        images = list(images_by_digest.values())
+        logger.info(
+            f"Found {len(images)} unique images "
+            f"({len(digest_by_xref)} image xrefs) in {len(doc)} pages."
+        )
+        return refs_by_page, images
+
+    def export(
+        self,
+        pdf_path: str,
+        images: List[ExtractedImage],
+        output_dir: str,
+    ) -> List[ExtractedImage]:
+        """
+        Decode and write each unique image as PNG into output_dir.
+
+        Decoding runs in a process pool; each worker opens the PDF once and
+        handles a slice of the images. Sets ExtractedImage.path on success.
+        """
+        if not images:
+            return images
+
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        jobs = [(img.digest, img.xref, img.smask) for img in images]
+        by_digest = {img.digest: img for img in images}
+
+        workers = max(1, min(self.workers, len(jobs)))
+        if self.executor is not None:
+            written = self._run_slices(self.executor, pdf_path, jobs, workers, output_dir)
+        elif workers == 1:
+            written = _export_pixmaps(pdf_path, jobs, output_dir, self.thumbnail_size)
+        else:
+            with make_image_executor(workers) as executor:
+                written = self._run_slices(executor, pdf_path, jobs, workers, output_dir)
+
+        for digest, path in written:
+            by_digest[digest].path = path
+
+        logger.info(
+            f"Exported {len(written)} / {len(images)} images from {pdf_path} to {output_dir}."
+        )
+        return images
+
+    def _run_slices(self, executor: Executor, pdf_path: str, jobs: List[Tuple[str, int, int]],
+                    workers: int, output_dir: str) -> List[Tuple[str, str]]:
+        """Split jobs into `workers` slices and export them on executor."""
+        written: List[Tuple[str, str]] = []
+        futures = [
+            executor.submit(
+                _export_pixmaps, pdf_path, jobs[i::workers], output_dir, self.thumbnail_size
+            )
+            for i in range(workers)
+        ]
+        for future in as_completed(futures):
+            written.extend(future.result())
+        return written
+
+    def _hash_image(self, doc: fitz.Document, xref: int, smask: int) -> str:
+        """Content hash of the raw image stream (plus its soft mask, if any)."""
+        h = hashlib.sha1(doc.xref_stream_raw(xref) or b"")
+        if smask:
+            h.update(doc.xref_stream_raw(smask) or b"")
+        return h.hexdigest()
+
+
+def make_image_executor(workers: int = 4) -> ProcessPoolExecutor:
+    """
+    Process pool for image decoding.
+
+    Uses the "spawn" start method: forking while other threads are inside
+    MuPDF (e.g. process_batch's thread pool) can deadlock the children.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def _export_pixmaps(
+    pdf_path: str,
+    jobs: List[Tuple[str, int, int]],
+    output_dir: str,
+    thumbnail_size: int | None,
+) -> List[Tuple[str, str]]:
+    """Worker: decode (digest, xref, smask) jobs and save PNGs. Returns (digest, path)."""
+    written: List[Tuple[str, str]] = []
+    doc = fitz.open(pdf_path)
+    try:
+        for digest, xref, smask in jobs:
+            try:
+                pix = fitz.Pixmap(doc, xref)
+                # PNG only supports gray/RGB; convert CMYK, Separation, etc.
+                if pix.colorspace and pix.colorspace.name not in (
+                    fitz.csGRAY.name, fitz.csRGB.name
+                ):
+                    pix = fitz.Pixmap(fitz.csRGB, pix)
+                if smask:
+                    mask = fitz.Pixmap(doc, smask)
+                    if (mask.width, mask.height) != (pix.width, pix.height):
+                        mask = fitz.Pixmap(mask, pix.width, pix.height, None)
+                    pix = fitz.Pixmap(pix, mask)
+
+                if thumbnail_size and max(pix.width, pix.height) > thumbnail_size:
+                    scale = thumbnail_size / max(pix.width, pix.height)
+                    pix = fitz.Pixmap(
+                        pix,
+                        max(1, round(pix.width * scale)),
+                        max(1, round(pix.height * scale)),
+                        None,
+                    )
+
+                out_path = Path(output_dir) / f"{digest[:16]}.png"
+                pix.save(str(out_path))
+                written.append((digest, str(out_path)))
+            except Exception as e:
+                logger.warning(f"Could not export image xref={xref} from {pdf_path}: {e}")
+    finally:
+        doc.close()
+    return written
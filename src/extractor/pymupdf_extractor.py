@@ -5,6 +5,7 @@ from typing import List
 
 import fitz  # PyMuPDF
 
+from src.extractor.image_extractor import PyMuPDFImageExtractor
 from src.models.schemas import PageBlock, PageResult, ExtractionResult
 
 logger = logging.getLogger(__name__)
@@ -13,8 +14,10 @@ logger = logging.getLogger(__name__)
 class PyMuPDFExtractor:
     """Extract text, blocks, and basic metadata from a PDF using PyMuPDF."""
 
-    def __init__(self, min_confidence: float = 0.85):
+    def __init__(self, min_confidence: float = 0.85,
+                 image_extractor: PyMuPDFImageExtractor | None = None):
         self.min_confidence = min_confidence
+        self.image_extractor = image_extractor or PyMuPDFImageExtractor()
 
     def extract(self, pdf_path: str,
                 board: str | None = None,
@@ -26,6 +29,9 @@ class PyMuPDFExtractor:
         logger.info(f"Opening PDF: {pdf_path}")
         doc = fitz.open(pdf_path)
 
+        # Image inventory: each image xref is hashed once for the whole document
+        image_refs, images = self.image_extractor.inventory(doc)
+
         pages: List[PageResult] = []
         for page_index in range(len(doc)):
             page = doc[page_index]
@@ -51,8 +57,8 @@ class PyMuPDFExtractor:
                 x0, y0, x1, y1 = b["bbox"]
                 blocks.append(PageBlock(text=text, x0=x0, y0=y0, x1=x1, y1=y1))
 
-            # Count images on page
-            image_count = len(page.get_images())
+            # Unique images drawn on this page
+            page_images = image_refs.get(page_number, [])
 
             # Very simple confidence heuristic
             confidence = self._estimate_confidence(raw_text)
@@ -61,7 +67,8 @@ class PyMuPDFExtractor:
                 page_number=page_number,
                 raw_text=raw_text,
                 blocks=blocks,
-                image_count=image_count,
+                images=page_images,
+                image_count=len(page_images),
                 table_count=0,  
                 confidence=confidence,
                 needs_ocr=confidence < self.min_confidence,
@@ -71,6 +78,7 @@ class PyMuPDFExtractor:
         extraction = ExtractionResult(
             pdf_path=pdf_path,
             pages=pages,
+            images=images,
             board=board,
             subject=subject,
             grade=grade,
@@ -79,9 +87,10 @@ class PyMuPDFExtractor:
         )
 
         logger.info(
-            f"Extracted {len(pages)} pages from {pdf_path} "
-            f"(min_confidence={self.min_confidence})."
+            f"Extracted {len(pages)} pages and {len(images)} unique images "
+            f"from {pdf_path} (min_confidence={self.min_confidence})."
         )
+        doc.close()
 
 
         return extraction
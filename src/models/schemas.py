@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -17,12 +17,44 @@ class PageBlock(BaseModel):
     y1: float
 
 
+class PageImageRef(BaseModel):
+    """Reference from a page to an image XObject in the PDF."""
+
+    xref: int
+    digest: str
+    width: int = 0
+    height: int = 0
+    name: Optional[str] = None
+
+
+class ExtractedImage(BaseModel):
+    """One unique image in a PDF (deduplicated by xref and content hash)."""
+
+    digest: str
+    xref: int
+    smask: int = 0
+    width: int = 0
+    height: int = 0
+    page_numbers: List[int] = Field(default_factory=list)
+    path: Optional[str] = None
+
+
+class ImageManifest(BaseModel):
+    """Unique images of one chapter and the pages that reference them."""
+
+    lesson_id: str
+    pdf_path: str
+    images: List[ExtractedImage] = Field(default_factory=list)
+    pages: Dict[int, List[PageImageRef]] = Field(default_factory=dict)
+
+
 class PageResult(BaseModel):
     """Result of processing a single page."""
 
     page_number: int
     raw_text: str
     blocks: List[PageBlock] = Field(default_factory=list)
+    images: List[PageImageRef] = Field(default_factory=list)
     image_count: int = 0  
     table_count: int = 0
     confidence: float = 1.0
@@ -34,6 +66,7 @@ class ExtractionResult(BaseModel):
     pdf_path: str
     lesson_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     pages: List[PageResult]
+    images: List[ExtractedImage] = Field(default_factory=list)
     board: Optional[str] = None
     subject: Optional[str] = None
     grade: Optional[int] = None
@@ -80,3 +113,31 @@ class ProcessingConfig(BaseModel):
     pinecone_index_name: str = "textbooks-prod"
     chunk_size: int = 512
     chunk_overlap: int = 50
+    extract_images: bool = False
+    image_thumbnail_size: Optional[int] = None
+    image_workers: int = 4
+
+
+class UpsertReport(BaseModel):
+    """
+    Summary of one Pinecone indexing run.
+
+    `seconds` is the time spent sending upserts and waiting for their
+    acknowledgements; `embed_seconds` is the rest of the run (chunking and
+    embedding, which overlap with requests in flight). Counts include
+    acknowledged requests only.
+    """
+
+    vectors: int = 0
+    requests: int = 0
+    seconds: float = 0.0
+    embed_seconds: float = 0.0
+    namespaces: Dict[str, int] = Field(default_factory=dict)
+
+    @property
+    def vectors_per_sec(self) -> float:
+        return self.vectors / self.seconds if self.seconds else 0.0
+
+    @property
+    def requests_per_sec(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
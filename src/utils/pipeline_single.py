@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import json
 import logging
+from concurrent.futures import Executor
 from datetime import datetime
 from pathlib import Path
 
+from src.extractor.image_extractor import PyMuPDFImageExtractor
 from src.extractor.pymupdf_extractor import PyMuPDFExtractor
-from src.models.schemas import ProcessingConfig, ExtractionResult, ValidatedResult
+from src.models.schemas import ProcessingConfig, ExtractionResult, ImageManifest, ValidatedResult
 
 logger = logging.getLogger(__name__)
 
@@ -15,13 +17,17 @@ def process_single_pdf(
     pdf_path: str,
     config: ProcessingConfig,
     output_dir: str = "output",
+    image_executor: Executor | None = None,
 ) -> ValidatedResult:
     """
     End-to-end processing of a single chapter PDF (text-only):
       1) Derive chapter_no and title from filename
       2) Extract with PyMuPDF
-      3) Merge pages into content
-      4) Save JSON to output/
+      3) Optionally export unique images to output/images/<lesson_id>/
+      4) Merge pages into content
+      5) Save JSON (and an image manifest, if the chapter has images) to output/
+
+    Pass image_executor to share one image decoding pool across PDFs.
     """
     pdf_path = str(pdf_path)
     pdf_stem = Path(pdf_path).stem  # e.g. "Chapter_01_Where_the_mind_is_without_fear"
@@ -29,7 +35,15 @@ def process_single_pdf(
 
     chapter_no, title = _parse_chapter_metadata_from_filename(pdf_stem)
 
-    extractor = PyMuPDFExtractor(min_confidence=config.min_page_confidence)
+    image_extractor = PyMuPDFImageExtractor(
+        thumbnail_size=config.image_thumbnail_size,
+        workers=config.image_workers,
+        executor=image_executor,
+    )
+    extractor = PyMuPDFExtractor(
+        min_confidence=config.min_page_confidence,
+        image_extractor=image_extractor,
+    )
     extraction: ExtractionResult = extractor.extract(
         pdf_path=pdf_path,
         board=config.board,
@@ -39,10 +53,15 @@ def process_single_pdf(
         language=config.language,
     )
 
+    if config.extract_images:
+        image_dir = Path(output_dir) / "images" / extraction.lesson_id
+        image_extractor.export(pdf_path, extraction.images, str(image_dir))
+
     merged_text = _merge_pages_to_content(extraction)
 
     overall_conf = min(p.confidence for p in extraction.pages) if extraction.pages else 0.0
-    image_count = sum(p.image_count for p in extraction.pages)
+    # Unique images across the chapter, not per-page placements
+    image_count = len(extraction.images)
     table_count = sum(p.table_count for p in extraction.pages)
 
     validated = ValidatedResult(
@@ -63,6 +82,8 @@ def process_single_pdf(
     )
 
     _save_validated_json(validated, output_dir)
+    if extraction.images:
+        _save_image_manifest(extraction, output_dir)
 
     logger.info(
         f"Finished processing {pdf_path} -> lesson_id={validated.lesson_id}, "
@@ -118,3 +139,22 @@ def _save_validated_json(validated: ValidatedResult, output_dir: str) -> None:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
     logger.info(f"Saved validated JSON to: {out_path}")
+
+
+def _save_image_manifest(extraction: ExtractionResult, output_dir: str) -> None:
+    """
+    Save the chapter's unique images (digest -> path, page_numbers) and the
+    per-page image references to output_dir/<lesson_id>_images.json.
+    """
+    manifest = ImageManifest(
+        lesson_id=extraction.lesson_id,
+        pdf_path=extraction.pdf_path,
+        images=extraction.images,
+        pages={p.page_number: p.images for p in extraction.pages if p.images},
+    )
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    out_path = Path(output_dir) / f"{extraction.lesson_id}_images.json"
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write(manifest.model_dump_json(indent=2))
+
+    logger.info(f"Saved image manifest to: {out_path}")
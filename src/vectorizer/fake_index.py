@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from multiprocessing.pool import ApplyResult, ThreadPool
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class FakePineconeIndex:
+    """
+    In-memory stand-in for a Pinecone Index handle.
+
+    Supports the upsert(..., async_req=True) calls made by PineconeVectorizer,
+    simulates per-request latency on a thread pool, and enforces the same
+    request limits as Pinecone so batching can be checked without the service.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        pool_threads: int = 8,
+        max_request_bytes: int = 2 * 1024 * 1024,
+        max_batch_vectors: int = 1000,
+    ):
+        self.latency = latency
+        self.max_request_bytes = max_request_bytes
+        self.max_batch_vectors = max_batch_vectors
+        self.namespaces: Dict[str, Dict[str, dict]] = {}
+        self.requests = 0
+        self.max_concurrent = 0
+        self.largest_request_bytes = 0
+        self.largest_batch = 0
+
+        self._pool = ThreadPool(pool_threads)
+        self._lock = threading.Lock()
+        self._active = 0
+
+    def upsert(self, vectors: List[dict], namespace: str | None = None,
+               async_req: bool = False) -> dict | ApplyResult:
+        """Store vectors under namespace; returns an ApplyResult if async_req."""
+        if async_req:
+            return self._pool.apply_async(self._upsert, (vectors, namespace))
+        return self._upsert(vectors, namespace)
+
+    def describe_index_stats(self) -> dict:
+        """Vector counts per namespace, shaped like Pinecone's response."""
+        with self._lock:
+            namespaces = {ns: {"vector_count": len(v)} for ns, v in self.namespaces.items()}
+        return {
+            "namespaces": namespaces,
+            "total_vector_count": sum(n["vector_count"] for n in namespaces.values()),
+        }
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+
+    def _upsert(self, vectors: List[dict], namespace: str | None) -> dict:
+        # Same serialization as the Pinecone REST client (ensure_ascii=True)
+        size = len(json.dumps({"vectors": vectors, "namespace": namespace}))
+        if size > self.max_request_bytes:
+            raise ValueError(f"Upsert request of {size} bytes exceeds {self.max_request_bytes}")
+        if len(vectors) > self.max_batch_vectors:
+            raise ValueError(f"Upsert of {len(vectors)} vectors exceeds {self.max_batch_vectors}")
+
+        with self._lock:
+            self._active += 1
+            self.max_concurrent = max(self.max_concurrent, self._active)
+            self.largest_request_bytes = max(self.largest_request_bytes, size)
+            self.largest_batch = max(self.largest_batch, len(vectors))
+        try:
+            time.sleep(self.latency)
+            with self._lock:
+                store = self.namespaces.setdefault(namespace or "", {})
+                for vec in vectors:
+                    store[vec["id"]] = vec
+                self.requests += 1
+        finally:
+            with self._lock:
+                self._active -= 1
+
+        return {"upserted_count": len(vectors)}
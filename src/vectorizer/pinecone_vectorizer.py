@@ -1,21 +1,68 @@
 from __future__ import annotations
 
+import json
 import logging
-from typing import List
+import re
+import string
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Tuple
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from pinecone import Pinecone
 
-from src.models.schemas import ValidatedResult
+from src.models.schemas import UpsertReport, ValidatedResult
+from src.vectorizer.projection import PCAProjection
 
 logger = logging.getLogger(__name__)
 
+# Pinecone rejects upsert requests above 2 MB or 1000 vectors
+MAX_REQUEST_BYTES = 2 * 1024 * 1024
+MAX_BATCH_VECTORS = 1000
+
+
+def format_namespace(pattern: str, fields: Mapping[str, Any]) -> str:
+    """
+    Fill a namespace pattern such as "{board}_{grade}_{subject}" from fields.
+
+    Values are lowercased with whitespace replaced by underscores:
+      'State Board Maharashtra', 4, 'Science' -> 'state_board_maharashtra_4_science'
+
+    Raises ValueError naming the field if the pattern uses a field that is
+    missing, None, or not a str/int.
+    """
+    values = {}
+    for _, name, _, _ in string.Formatter().parse(pattern):
+        if name is None:
+            continue
+        if name not in fields:
+            raise ValueError(f"namespace_pattern {pattern!r} uses unknown field {name!r}")
+        value = fields[name]
+        if value is None or isinstance(value, bool) or not isinstance(value, (str, int)):
+            raise ValueError(
+                f"namespace_pattern field {name!r} must be a str or int, got {value!r}"
+            )
+        values[name] = re.sub(r"[\s/]+", "_", str(value).strip()).lower()
+    return pattern.format(**values)
+
+
+def namespace_for(res: ValidatedResult, pattern: str) -> str:
+    """Build a lesson's namespace from a pattern (see format_namespace)."""
+    return format_namespace(pattern, res.model_dump())
+
 
 class PineconeVectorizer:
     """
     Chunk lesson content, embed with local Hugging Face model,
     and upsert into Pinecone.
+
+    If a PCAProjection is given, embeddings are projected to its dimension
+    before upsert; the Pinecone index must be created with that dimension.
+
+    Upserts are sent asynchronously over the index's connection pool
+    (`pool_threads`). Pass `index` (e.g. a FakePineconeIndex) and
+    `embeddings` to use existing objects instead of connecting/loading.
     """
 
     def __init__(
@@ -25,10 +72,17 @@ class PineconeVectorizer:
         chunk_size: int = 512,
         chunk_overlap: int = 50,
         model_name: str = "intfloat/multilingual-e5-large",
+        projection: PCAProjection | None = None,
+        pool_threads: int = 8,
+        index: Any | None = None,
+        embeddings: Any | None = None,
+        max_request_bytes: int = MAX_REQUEST_BYTES,
     ):
-        # Connect to Pinecone index
-        self.pc = Pinecone(api_key=api_key)
-        self.index = self.pc.Index(index_name)
+        # Connect to Pinecone index (pooled connections for concurrent upserts)
+        if index is None:
+            self.pc = Pinecone(api_key=api_key, pool_threads=pool_threads)
+            index = self.pc.Index(index_name)
+        self.index = index
 
         # Recursive text splitter for chunking
         self.splitter = RecursiveCharacterTextSplitter(
@@ -38,29 +92,91 @@ class PineconeVectorizer:
         )
 
         # Local embedding model from Hugging Face
-        self.embeddings = HuggingFaceEmbeddings(model_name=model_name)
+        self.embeddings = embeddings or HuggingFaceEmbeddings(model_name=model_name)
+
+        # Optional dimensionality reduction applied after embedding
+        self.projection = projection
+
+        # Leave headroom below the request limit for request framing
+        self.max_request_bytes = max_request_bytes
+        self._request_bytes_budget = int(max_request_bytes * 0.95)
 
-    def _embed(self, text: str) -> List[float]:
-        """Embed a single chunk of text."""
-        return self.embeddings.embed_query(text)
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of chunks, projecting them as one batch."""
+        embs = self.embeddings.embed_documents(texts)
+        if self.projection is not None:
+            return self.projection.transform(embs).tolist()
+        return embs
 
     def upsert_validated_results(
         self,
         results: List[ValidatedResult],
         namespace: str | None = None,
         batch_size: int = 100,
-    ) -> None:
-        """Chunk, embed, and upsert a list of ValidatedResult objects."""
-        for res in results:
-            self._upsert_single(res, namespace=namespace, batch_size=batch_size)
+        namespace_pattern: str | None = None,
+        max_in_flight: int = 8,
+    ) -> UpsertReport:
+        """
+        Chunk, embed, and upsert a list of ValidatedResult objects.
+
+        Each lesson goes to `namespace` if given, otherwise to the namespace
+        built from `namespace_pattern` (see namespace_for). Vectors are
+        buffered per namespace, and a buffer is sent as soon as it reaches
+        `batch_size` vectors or `max_request_bytes` of payload, so upserts
+        overlap with embedding. At most `max_in_flight` requests are
+        outstanding at once, across all namespaces.
+        """
+        batch_size = min(batch_size, MAX_BATCH_VECTORS)
+
+        # Resolve namespaces up front so a bad pattern fails before any upsert
+        namespaces = [
+            namespace_for(res, namespace_pattern)
+            if namespace is None and namespace_pattern else namespace
+            for res in results
+        ]
+
+        report = UpsertReport()
+        start = time.perf_counter()
+        buffers: Dict[str | None, List[dict]] = {}
+        buffer_bytes: Dict[str | None, int] = {}
+        pending: Deque[Tuple[Any, str | None, int]] = deque()
+        try:
+            for res, ns in zip(results, namespaces):
+                for vec in self._build_vectors(res, batch_size):
+                    size = _vector_bytes(vec)
+                    buf = buffers.setdefault(ns, [])
+                    if buf and (
+                        len(buf) >= batch_size
+                        or buffer_bytes[ns] + size > self._request_bytes_budget
+                    ):
+                        self._upsert_batch(buf, ns, pending, max_in_flight, report)
+                        buf = buffers[ns] = []
+                        buffer_bytes[ns] = 0
+                    buf.append(vec)
+                    buffer_bytes[ns] = buffer_bytes.get(ns, 0) + size
+
+            for ns, buf in buffers.items():
+                if buf:
+                    self._upsert_batch(buf, ns, pending, max_in_flight, report)
+
+            while pending:
+                self._ack(pending.popleft(), report)
+        finally:
+            # On error, let requests already in flight finish before propagating
+            for handle, _, _ in pending:
+                handle.wait()
+
+        report.embed_seconds = time.perf_counter() - start - report.seconds
+        logger.info(
+            f"Upserted {report.vectors} vectors in {report.requests} requests "
+            f"across {len(report.namespaces)} namespaces; {report.seconds:.1f}s spent on upserts "
+            f"({report.requests_per_sec:.1f} upserts/s, {report.vectors_per_sec:.1f} vectors/s), "
+            f"{report.embed_seconds:.1f}s on chunking and embedding."
+        )
+        return report
 
-    def _upsert_single(
-        self,
-        res: ValidatedResult,
-        namespace: str | None = None,
-        batch_size: int = 100,
-    ) -> None:
-        """Process one lesson/chapter and upsert its chunks."""
+    def _build_vectors(self, res: ValidatedResult, batch_size: int = 100) -> Iterator[dict]:
+        """Chunk and embed one lesson/chapter, yielding Pinecone vector dicts."""
         text = res.content or ""
         if not text.strip():
             logger.warning(f"Empty content for lesson_id={res.lesson_id}, skipping upsert.")
@@ -70,10 +186,12 @@ class PineconeVectorizer:
         chunks = self.splitter.split_text(text)
         logger.info(f"Lesson {res.lesson_id}: split into {len(chunks)} chunks.")
 
-        # 2) Embed each chunk and prepare vectors
-        vectors = []
+        # 2) Embed chunks in batches and prepare vectors
+        embs: List[List[float]] = []
         for i, chunk in enumerate(chunks):
-            emb = self._embed(chunk)
+            if i % batch_size == 0:
+                embs = self._embed_batch(chunks[i:i + batch_size])
+            emb = embs[i % batch_size]
             meta = {
                 "lesson_id": res.lesson_id,
                 "board": res.board,
@@ -86,23 +204,50 @@ class PineconeVectorizer:
                 "chunk_id": i,
                 "chunk_text": chunk[:1000],
             }
-            vectors.append(
-                {
-                    "id": f"{res.lesson_id}_{i}",
-                    "values": emb,
-                    "metadata": meta,
-                }
-            )
-
-            # Upsert in batches
-            if len(vectors) >= batch_size:
-                self._upsert_batch(vectors, namespace)
-                vectors = []
+            if self.projection is not None:
+                meta["projection"] = self.projection.version
+            yield {
+                "id": f"{res.lesson_id}_{i}",
+                "values": emb,
+                "metadata": meta,
+            }
 
-        if vectors:
-            self._upsert_batch(vectors, namespace)
+    def _upsert_batch(
+        self,
+        vectors: List[dict],
+        namespace: str | None,
+        pending: Deque[Tuple[Any, str | None, int]],
+        max_in_flight: int,
+        report: UpsertReport,
+    ) -> None:
+        """Send one batch asynchronously, first waiting while max_in_flight requests are pending."""
+        while len(pending) >= max_in_flight:
+            self._ack(pending.popleft(), report)
+
+        start = time.perf_counter()
+        handle = self.index.upsert(vectors=vectors, namespace=namespace, async_req=True)
+        report.seconds += time.perf_counter() - start
+        pending.append((handle, namespace, len(vectors)))
+
+    def _ack(self, item: Tuple[Any, str | None, int], report: UpsertReport) -> None:
+        """Wait for one upsert and count it once Pinecone has acknowledged it."""
+        handle, namespace, count = item
+        start = time.perf_counter()
+        handle.get()
+        report.seconds += time.perf_counter() - start
+
+        report.vectors += count
+        report.requests += 1
+        key = namespace or ""
+        report.namespaces[key] = report.namespaces.get(key, 0) + count
+        logger.info(f"Upserted batch of {count} vectors to Pinecone (ns={namespace}).")
+
+
+def _vector_bytes(vector: dict) -> int:
+    """
+    JSON payload size of one vector in an upsert request.
 
-    def _upsert_batch(self, vectors, namespace: str | None) -> None:
-        """Helper to upsert one batch of vectors into Pinecone."""
-        self.index.upsert(vectors=vectors, namespace=namespace)
-        logger.info(f"Upserted batch of {len(vectors)} vectors to Pinecone (ns={namespace}).")
+    Serialized like the Pinecone client does (json.dumps with the default
+    ensure_ascii), so non-ASCII text such as Devanagari counts as \\uXXXX escapes.
+    """
+    return len(json.dumps(vector)) + 2
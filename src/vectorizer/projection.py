@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Iterable, List, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class PCAProjection:
+    """
+    Linear dimensionality reduction for embedding vectors.
+
+    Fitted with a NumPy SVD on a sample of corpus embeddings. Inputs are
+    L2-normalized before centering in both fit() and transform(), so raw
+    model output can be passed directly. The same projection (identified by
+    its version tag) must be used at index time and at query time, and the
+    Pinecone index dimension must equal `dim`.
+    """
+
+    def __init__(self, mean: np.ndarray, components: np.ndarray, version: str):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)
+        self.version = version
+
+    @property
+    def source_dim(self) -> int:
+        return int(self.components.shape[1])
+
+    @property
+    def dim(self) -> int:
+        return int(self.components.shape[0])
+
+    @classmethod
+    def fit(cls, vectors: Sequence[Sequence[float]], dim: int,
+            version: str | None = None) -> "PCAProjection":
+        """Fit the top-`dim` principal components of `vectors`."""
+        X = np.asarray(vectors, dtype=np.float32)
+        if X.ndim != 2:
+            raise ValueError(f"Expected a 2D array of vectors, got shape {X.shape}")
+        if dim > min(X.shape):
+            raise ValueError(
+                f"Cannot fit {dim} components from {X.shape[0]} vectors of dim {X.shape[1]}"
+            )
+        X = _l2_normalize(X)
+
+        mean = X.mean(axis=0)
+        _, s, vt = np.linalg.svd(X - mean, full_matrices=False)
+        components = vt[:dim]
+
+        explained = float((s[:dim] ** 2).sum() / (s ** 2).sum()) if s.any() else 0.0
+        if version is None:
+            digest = hashlib.sha1(components.tobytes()).hexdigest()[:8]
+            version = f"pca{dim}-{digest}"
+
+        logger.info(
+            f"Fitted PCA projection {version}: {X.shape[1]} -> {dim} dims "
+            f"on {X.shape[0]} vectors (explained variance {explained:.3f})."
+        )
+        return cls(mean=mean, components=components, version=version)
+
+    def transform(self, vectors: Sequence[Sequence[float]],
+                  batch_size: int = 1024) -> np.ndarray:
+        """Project and L2-normalize vectors in batches (cosine-ready)."""
+        X = np.asarray(vectors, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != self.source_dim:
+            raise ValueError(
+                f"Projection {self.version} expects dim {self.source_dim}, got {X.shape[1]}"
+            )
+
+        out = np.empty((X.shape[0], self.dim), dtype=np.float32)
+        for start in range(0, X.shape[0], batch_size):
+            batch = (_l2_normalize(X[start:start + batch_size]) - self.mean) @ self.components.T
+            out[start:start + batch_size] = _l2_normalize(batch)
+        return out
+
+    def transform_one(self, vector: Sequence[float]) -> List[float]:
+        """Project a single vector (e.g. a query embedding)."""
+        return self.transform([vector])[0].tolist()
+
+    def save(self, path: str) -> None:
+        """Persist the projection to a .npz file."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, mean=self.mean, components=self.components,
+                 version=np.array(self.version))
+        logger.info(f"Saved projection {self.version} to: {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "PCAProjection":
+        """Load a projection saved with save()."""
+        with np.load(path) as data:
+            proj = cls(mean=data["mean"], components=data["components"],
+                       version=str(data["version"]))
+        logger.info(f"Loaded projection {proj.version} ({proj.source_dim} -> {proj.dim}) from {path}")
+        return proj
+
+
+def quantize_int8(vectors: Sequence[Sequence[float]]) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-vector int8 quantization. Returns (codes, scales)."""
+    X = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(X).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(X / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def quantize_binary(vectors: Sequence[Sequence[float]]) -> np.ndarray:
+    """Sign-bit quantization packed into uint8 (dim / 8 bytes per vector)."""
+    X = np.asarray(vectors, dtype=np.float32)
+    return np.packbits(X > 0, axis=1)
+
+
+def search_int8(query: Sequence[float], codes: np.ndarray, scales: np.ndarray,
+                top_k: int = 5) -> np.ndarray:
+    """Indices of the top_k int8 vectors by dot product with query."""
+    q = np.asarray(query, dtype=np.float32)
+    scores = (codes.astype(np.float32) @ q) * scales
+    return _top_k(scores, top_k)
+
+
+def search_binary(query: Sequence[float], codes: np.ndarray, top_k: int = 5) -> np.ndarray:
+    """Indices of the top_k binary vectors by Hamming distance to query."""
+    q = quantize_binary([query])[0]
+    dist = np.unpackbits(np.bitwise_xor(codes, q), axis=1).sum(axis=1)
+    return _top_k(-dist.astype(np.float32), top_k)
+
+
+def recall_at_k(truth: Iterable[Sequence[int]], found: Iterable[Sequence[int]]) -> float:
+    """Mean fraction of true neighbours recovered per query."""
+    scores = [len(set(t) & set(f)) / len(t) for t, f in zip(truth, found) if len(t)]
+    return float(np.mean(scores)) if scores else 0.0
+
+
+def _top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+    top_k = min(top_k, scores.shape[0])
+    idx = np.argpartition(-scores, top_k - 1)[:top_k]
+    return idx[np.argsort(-scores[idx])]
+
+
+def _l2_normalize(X: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return X / norms
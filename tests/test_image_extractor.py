@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from src.extractor.image_extractor import PyMuPDFImageExtractor
+from src.models.schemas import ImageManifest, ProcessingConfig
+from src.utils.pipeline_single import process_single_pdf
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+GEOMETRY_PDF = REPO_ROOT / "Chapter_01_Geometry_chp_1.pdf"
+
+
+def test_inventory_dedups_shared_images():
+    doc = fitz.open(GEOMETRY_PDF)
+    try:
+        placements = sum(len(doc.get_page_images(i)) for i in range(len(doc)))
+        refs_by_page, images = PyMuPDFImageExtractor().inventory(doc)
+    finally:
+        doc.close()
+
+    assert placements == 13
+    assert len(images) == 7
+    assert len({img.digest for img in images}) == 7
+
+    # Per-page refs and per-image page lists describe the same placements
+    for img in images:
+        assert img.page_numbers
+        for page_number in img.page_numbers:
+            assert img.digest in {ref.digest for ref in refs_by_page[page_number]}
+    referenced = {ref.digest for refs in refs_by_page.values() for ref in refs}
+    assert referenced == {img.digest for img in images}
+
+
+def test_pipeline_writes_image_manifest(tmp_path):
+    config = ProcessingConfig(
+        board="State Board Maharashtra",
+        subject="Maths",
+        grade=9,
+        book="Geometry",
+        extract_images=True,
+        image_thumbnail_size=64,
+        image_workers=1,
+    )
+    validated = process_single_pdf(str(GEOMETRY_PDF), config=config, output_dir=str(tmp_path))
+    assert validated.image_count == 7
+
+    manifest_path = tmp_path / f"{validated.lesson_id}_images.json"
+    manifest = ImageManifest(**json.loads(manifest_path.read_text(encoding="utf-8")))
+
+    assert len(manifest.images) == 7
+    for img in manifest.images:
+        assert img.path and Path(img.path).is_file()
+        for page_number in img.page_numbers:
+            assert img.digest in {ref.digest for ref in manifest.pages[page_number]}
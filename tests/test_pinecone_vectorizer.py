@@ -0,0 +1,154 @@
+import pinecone
+import pytest
+
+from src.models.schemas import ValidatedResult
+from src.vectorizer.fake_index import FakePineconeIndex
+from src.vectorizer.pinecone_vectorizer import (
+    MAX_REQUEST_BYTES,
+    PineconeVectorizer,
+    namespace_for,
+)
+
+PATTERN = "{board}_{grade}_{subject}"
+ENGLISH_TEXT = "Plants need water and sunlight to grow. "
+MARATHI_TEXT = "झाडांना वाढण्यासाठी पाणी आणि सूर्यप्रकाश लागतो. "
+
+
+class StubEmbeddings:
+    """Deterministic stand-in for HuggingFaceEmbeddings."""
+
+    def __init__(self, dim: int = 64):
+        self.dim = dim
+
+    def embed_documents(self, texts):
+        return [[(len(t) % 7) / 7.0 + 0.123456789] * self.dim for t in texts]
+
+
+def _lesson(lesson_id: str, subject: str, grade: int = 4,
+            text: str = ENGLISH_TEXT, repeat: int = 400) -> ValidatedResult:
+    return ValidatedResult(
+        lesson_id=lesson_id,
+        board="State Board Maharashtra",
+        subject=subject,
+        grade=grade,
+        book="Play, Do, Learn",
+        chapter_no="01",
+        title=f"Lesson {lesson_id}",
+        content=text * repeat,
+        language="en",
+    )
+
+
+def _vectorizer(index: FakePineconeIndex, max_request_bytes: int,
+                dim: int = 64, chunk_size: int = 200) -> PineconeVectorizer:
+    return PineconeVectorizer(
+        api_key="unused",
+        index_name="unused",
+        chunk_size=chunk_size,
+        chunk_overlap=0,
+        index=index,
+        embeddings=StubEmbeddings(dim),
+        max_request_bytes=max_request_bytes,
+    )
+
+
+def test_upserts_route_by_namespace_within_limits():
+    max_request_bytes = 64 * 1024
+    max_in_flight = 3
+    index = FakePineconeIndex(latency=0.01, pool_threads=8, max_request_bytes=max_request_bytes)
+    lessons = [
+        _lesson("sci-1", "Science"),
+        _lesson("eng-1", "English"),
+        _lesson("sci-2", "Science"),
+        _lesson("mat-1", "Maths", grade=5),
+        _lesson("mar-1", "Marathi", text=MARATHI_TEXT),
+    ]
+
+    try:
+        report = _vectorizer(index, max_request_bytes).upsert_validated_results(
+            lessons,
+            batch_size=100,
+            namespace_pattern=PATTERN,
+            max_in_flight=max_in_flight,
+        )
+    finally:
+        index.close()
+
+    stored = index.namespaces
+    assert set(stored) == {
+        "state_board_maharashtra_4_science",
+        "state_board_maharashtra_4_english",
+        "state_board_maharashtra_5_maths",
+        "state_board_maharashtra_4_marathi",
+    }
+    for lesson in lessons:
+        ns = namespace_for(lesson, PATTERN)
+        assert any(vid.startswith(f"{lesson.lesson_id}_") for vid in stored[ns])
+        others = [n for n in stored if n != ns]
+        assert not any(vid.startswith(f"{lesson.lesson_id}_") for n in others for vid in stored[n])
+
+    assert index.largest_request_bytes <= max_request_bytes
+    assert index.largest_batch <= 100
+    assert 1 < index.max_concurrent <= max_in_flight
+
+    total = sum(len(v) for v in stored.values())
+    assert report.vectors == total
+    assert report.requests == index.requests
+    # Byte limit, not batch_size, forces the splitting here
+    assert report.requests > len(stored)
+    assert report.requests_per_sec > 0
+
+
+def test_devanagari_batches_stay_under_pinecone_limit():
+    # 1024-dim vectors with Devanagari metadata: \uXXXX escapes make each
+    # character 6 bytes on the wire, so batches must be split on that size
+    index = FakePineconeIndex(latency=0.0, max_request_bytes=MAX_REQUEST_BYTES)
+    lesson = _lesson("mar-1", "Marathi", text=MARATHI_TEXT, repeat=3000)
+    vectorizer = _vectorizer(index, MAX_REQUEST_BYTES, dim=1024, chunk_size=1000)
+    try:
+        report = vectorizer.upsert_validated_results([lesson], batch_size=1000)
+    finally:
+        index.close()
+
+    assert report.requests > 1
+    assert index.largest_request_bytes <= MAX_REQUEST_BYTES
+
+
+def test_constructor_connects_with_pooled_client(monkeypatch):
+    opened = {}
+
+    def fake_index(self, name="", host=""):
+        opened["name"] = name
+        opened["pool_threads"] = self.pool_threads
+        return FakePineconeIndex(latency=0.0)
+
+    monkeypatch.setattr(pinecone.Pinecone, "Index", fake_index)
+    vectorizer = PineconeVectorizer(
+        api_key="test-key",
+        index_name="textbooks-test",
+        pool_threads=6,
+        embeddings=StubEmbeddings(),
+    )
+    try:
+        assert opened == {"name": "textbooks-test", "pool_threads": 6}
+        report = vectorizer.upsert_validated_results([_lesson("sci-1", "Science")])
+        assert report.vectors == len(vectorizer.index.namespaces[""])
+    finally:
+        vectorizer.index.close()
+
+
+@pytest.mark.parametrize("pattern, field", [
+    ("{board}_{confidence}", "confidence"),
+    ("{board}_{page_number}", "page_number"),
+    ("{board}_{unit}", "unit"),
+])
+def test_bad_namespace_pattern_fails_before_upsert(pattern, field):
+    index = FakePineconeIndex(latency=0.0)
+    try:
+        with pytest.raises(ValueError, match=repr(field)):
+            _vectorizer(index, 64 * 1024).upsert_validated_results(
+                [_lesson("sci-1", "Science")], namespace_pattern=pattern
+            )
+    finally:
+        index.close()
+    assert index.requests == 0
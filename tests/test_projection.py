@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from src.vectorizer.projection import (
+    PCAProjection,
+    quantize_binary,
+    quantize_int8,
+    recall_at_k,
+    search_binary,
+    search_int8,
+)
+
+
+def _vectors(n: int = 200, source_dim: int = 128, rank: int = 16) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return (rng.normal(size=(n, rank)) @ rng.normal(size=(rank, source_dim))).astype(np.float32)
+
+
+def test_save_load_round_trip(tmp_path):
+    X = _vectors()
+    projection = PCAProjection.fit(X, 16)
+    assert projection.version.startswith("pca16-")
+
+    path = tmp_path / "pca.npz"
+    projection.save(str(path))
+    loaded = PCAProjection.load(str(path))
+
+    assert loaded.version == projection.version
+    assert (loaded.source_dim, loaded.dim) == (128, 16)
+    np.testing.assert_array_equal(loaded.transform(X), projection.transform(X))
+
+
+def test_transform_normalizes_input():
+    X = _vectors()
+    projection = PCAProjection.fit(X, 16)
+
+    out = projection.transform(X * 5.0, batch_size=7)
+    np.testing.assert_allclose(out, projection.transform(X), atol=1e-5)
+    np.testing.assert_allclose(np.linalg.norm(out, axis=1), 1.0, atol=1e-5)
+
+
+def test_dimension_mismatch_raises():
+    projection = PCAProjection.fit(_vectors(), 16)
+    with pytest.raises(ValueError, match="expects dim 128"):
+        projection.transform(np.ones((3, 64), dtype=np.float32))
+    with pytest.raises(ValueError, match="Cannot fit"):
+        PCAProjection.fit(_vectors(n=10), 16)
+
+
+def test_quantized_search_finds_query_first():
+    X = _vectors()
+    X /= np.linalg.norm(X, axis=1, keepdims=True)
+    codes, scales = quantize_int8(X)
+    bits = quantize_binary(X)
+    assert codes.dtype == np.int8 and bits.shape == (200, 128 // 8)
+
+    for i in range(0, 200, 20):
+        assert search_int8(X[i], codes, scales, top_k=5)[0] == i
+        assert search_binary(X[i], bits, top_k=5)[0] == i
+
+
+def test_recall_at_k():
+    assert recall_at_k([[1, 2], [3, 4]], [[2, 1], [3, 5]]) == pytest.approx(0.75)